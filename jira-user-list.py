@@ -1,11 +1,14 @@
 import sys
+import base64
 import traceback
 import signal
 import requests
-from requests.auth import HTTPBasicAuth
 import json
 import urllib3
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from jira2gitlab_secrets import *
 from jira2gitlab_config import *
@@ -13,66 +16,128 @@ from jira2gitlab_config import *
 ### set library defaults
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# increase the number of retry connections
-requests.adapters.DEFAULT_RETRIES = 10
+# Use a single session for all Jira calls, so that connections are kept alive
+# and reused across pages instead of doing a new TCP+TLS handshake for each request.
+# The pool is large enough for all concurrent requests.
+SESSION = requests.Session()
+adapter = HTTPAdapter(pool_connections=4, pool_maxsize=USER_LIST_PROJECT_WORKERS * JIRA_SEARCH_WORKERS, max_retries=Retry(total=10, backoff_factor=0.3))
+SESSION.mount('http://', adapter)
+SESSION.mount('https://', adapter)
+SESSION.verify = VERIFY_SSL_CERTIFICATE
+# The basic auth header is computed once, instead of by an auth handler on every request
+JIRA_BASIC_AUTH = base64.b64encode(':'.join(JIRA_ACCOUNT).encode('latin1')).decode('ascii')
+SESSION.headers.update({
+    'Authorization': f'Basic {JIRA_BASIC_AUTH}',
+    'Accept': 'application/json',
+    'Connection': 'keep-alive',
+})
 
-# close redundant connections
-# requests uses the urllib3 library, the default http connection is keep-alive, requests set False to close.
-s = requests.session()
-s.keep_alive = False
+# Build the search query of a project, up to the startAt value
+# The JQL is URL-encoded, so that project keys with special characters don't break the request
+def search_query_base(jira_project, page_size):
+    params = urllib.parse.urlencode({
+        'jql': f'project="{jira_project}" ORDER BY key',
+        'fields': 'reporter,assignee,comment',
+        'maxResults': page_size,
+    })
+    return f'{JIRA_API}/search?{params}&startAt='
 
-# Jira users that could not be mapped to Gitlab users
-jira_users = set()
+# Fetch one page of Jira issues
+def fetch_page(query_base, start_at):
+    query = query_base + str(start_at)
+    try:
+        jira_issues_batch = SESSION.get(query)
+        jira_issues_batch.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Unable to query {query} in Jira!\n{e}")
+    return jira_issues_batch.json()
 
+# Collect the participants of a page of Jira issues into jira_users
+def collect_users(jira_issues, jira_users):
+    add = jira_users.add
+    update = jira_users.update
+    for issue in jira_issues:
+        fields = issue['fields']
+
+        # Reporter (if no reporter is available, there is nobody to collect)
+        reporter = fields.get('reporter')
+        if reporter and 'name' in reporter:
+            add(reporter['name'])
+
+        # Assignee (can be empty)
+        assignee = fields['assignee']
+        if assignee:
+            add(assignee['name'])
+
+        # Comments (most issues have none, and the field may be missing)
+        comment_container = fields.get('comment')
+        comments = comment_container.get('comments') if comment_container else None
+        if comments:
+            update(comment['author']['name'] for comment in comments)
+
+# Get the set of Jira users that created, are assigned to, or commented on an issue of a project,
+# and the number of issues looked at
+# This runs in worker threads, one per project: progress is reported by the main thread
 def project_users(jira_project):
+    jira_users = set()
+
     # Load Jira project issues, with pagination (Jira has a limit on returned items)
-    # This assumes they will all fit in memory
-    start_at = 0
-    jira_issues = []
-    while True:
-        query = f'{JIRA_API}/search?jql=project="{jira_project}" ORDER BY key&fields=*navigable,attachment,comment,worklog&maxResults={str(JIRA_PAGINATION_SIZE)}&startAt={start_at}'
+    # Each page is processed as soon as it arrives and then discarded,
+    # so only the pages in flight are kept in memory.
+    # Only the fields we read are requested, so pages can be much larger than for a full import.
+    page_size = max(JIRA_PAGINATION_SIZE, 1000)
+
+    # The first page tells us the total number of issues, and the page size actually
+    # granted by the server (Jira may cap maxResults). The remaining pages are fetched concurrently.
+    page = fetch_page(search_query_base(jira_project, page_size), 0)
+    total = page.get('total')
+    loaded = len(page['issues'])
+    page_size = page.get('maxResults') or page_size
+    collect_users(page['issues'], jira_users)
+
+    query_base = search_query_base(jira_project, page_size)
+    if total is not None:
+        executor = ThreadPoolExecutor(max_workers=JIRA_SEARCH_WORKERS)
         try:
-            jira_issues_batch = requests.get(
-                query,
-                auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-                verify = VERIFY_SSL_CERTIFICATE,
-                headers = {'Content-Type': 'application/json'}
-            )
-            jira_issues_batch.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Unable to query {query} in Jira!\n{e}")
-        jira_issues_batch = jira_issues_batch.json()['issues']
-        if not jira_issues_batch:
-            break
-
-        start_at = start_at + len(jira_issues_batch)
-        jira_issues.extend(jira_issues_batch)
-        print(f"\r[INFO] Loading Jira issues from project {jira_project} ... {str(start_at)}", end='', flush=True)
-    print("\n")
-
-    # Import issues into Gitlab
-    for index, issue in enumerate(jira_issues, start=1):
-        print(f"\r[INFO] #{index}/{len(jira_issues)} Looking at Jira issue {issue['key']} ...   ", end='', flush=True)
-
-        # Reporter
-        reporter = 'jira' # if no reporter is available, use root
-        if ('reporter' in issue['fields'] and
-             issue['fields']['reporter'] and
-            'name' in issue['fields']['reporter']):
-            reporter = issue['fields']['reporter']['name']
-            jira_users.add(reporter)
+            pages = executor.map(lambda start_at: fetch_page(query_base, start_at),
+                                 range(loaded, total, page_size))
+            for page in pages:
+                loaded += len(page['issues'])
+                collect_users(page['issues'], jira_users)
+                # A short page before the total means the offsets no longer match the issues
+                # (e.g. issues were created or deleted meanwhile), the rest is loaded one page at a time
+                if len(page['issues']) < page_size and loaded < total:
+                    break
+        finally:
+            executor.shutdown(cancel_futures=True)
 
-        # Assignee (can be empty)
-        if issue['fields']['assignee']:
-            jira_users.add(issue['fields']['assignee']['name'])
+    # Without a total, or when the pages did not add up to it, load one page after the other until an empty one.
+    # A full last page may also be followed by issues created meanwhile.
+    if total is None or loaded < total or len(page['issues']) == page_size:
+        while True:
+            page = fetch_page(query_base, loaded)
+            if not page['issues']:
+                break
+            loaded += len(page['issues'])
+            collect_users(page['issues'], jira_users)
 
-        for comment in issue['fields']['comment']['comments']:
-            author = comment['author']['name']
-            jira_users.add(author)
+    return jira_users, loaded
 
-    print("\n")
-    print(*list(dict.fromkeys(sorted(jira_users))), sep = "\n")
+# Projects are independent, look at them concurrently
+# A line is printed as each project is done, the participants are reported in PROJECTS order
+jira_projects = list(PROJECTS)
+with ThreadPoolExecutor(max_workers=USER_LIST_PROJECT_WORKERS) as executor:
+    futures = {executor.submit(project_users, jira_project): jira_project for jira_project in jira_projects}
+    done_users = dict()
+    next_project = 0
+    for future in as_completed(futures):
+        jira_users, loaded = future.result()
+        done_users[futures[future]] = jira_users
+        print(f"[INFO] Looked at {loaded} Jira issues from project {futures[future]}", flush=True)
 
-for jira_project, gitlab_project in PROJECTS.items():
-    print(f"\n\nGet participants of {jira_project}")
-    project_users(jira_project)
+        while next_project < len(jira_projects) and jira_projects[next_project] in done_users:
+            jira_project = jira_projects[next_project]
+            print(f"\nParticipants of {jira_project}\n")
+            # jira_users is a set, so sorting is enough
+            sys.stdout.write('\n'.join(sorted(done_users.pop(jira_project))) + '\n\n')
+            next_project += 1
@@ -7,10 +7,14 @@
 
 import re
 import sys
+import os
+import time
 import uuid
 import json
 import pickle
 import hashlib
+import functools
+import threading
 import urllib3
 import urllib.parse
 import unicodedata
@@ -18,7 +22,10 @@ import traceback
 import signal
 import requests
 from requests.auth import HTTPBasicAuth
-from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any
 
@@ -29,13 +36,36 @@ from jira2gitlab_config import *
 ### set library defaults
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# increase the number of retry connections
-requests.adapters.DEFAULT_RETRIES = 10
-
-# close redundant connections
-# requests uses the urllib3 library, the default http connection is keep-alive, requests set False to close.
-s = requests.session()
-s.keep_alive = False
+# Retries of transient failures
+# POSTs are not idempotent (e.g. a note would be added twice), so they are only retried
+# when the server refused them without processing them: 429 Too Many Requests and 503 Service Unavailable
+class TransientErrorRetry(Retry):
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST':
+            return bool(self.total) and status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
+# One session per host: connections are kept alive and reused across calls,
+# and the authentication / SSL options are set once for all calls.
+# The pools are large enough for the worker threads preparing issues (and moving their attachments).
+def new_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=max(32, ISSUE_WORKERS * ATTACHMENT_WORKERS + NOTE_WORKERS),
+        max_retries=TransientErrorRetry(total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.verify = VERIFY_SSL_CERTIFICATE
+    return session
+
+jira_session = new_session()
+jira_session.auth = HTTPBasicAuth(*JIRA_ACCOUNT)
+jira_session.headers.update({'Content-Type': 'application/json'})
+
+gitlab_session = new_session()
+gitlab_session.headers.update({'PRIVATE-TOKEN': GITLAB_TOKEN})
 
 # Translate types that the json module cannot encode
 def json_encoder(obj):
@@ -43,9 +73,12 @@ def json_encoder(obj):
         return list(obj)
 
 # Hash a dictionary
+# Note: the hash is stored in the import status, changing how it is computed
+# would make all previously imported issues look changed (and re-imported).
+# The JSON documents come from Jira and cannot be circular, so that check is skipped.
 def dict_hash(dictionary: Dict[str, Any]) -> str:
     dhash = hashlib.md5()
-    encoded = json.dumps(dictionary, sort_keys=True).encode()
+    encoded = json.dumps(dictionary, sort_keys=True, check_circular=False).encode()
     dhash.update(encoded)
     return dhash.hexdigest()
 
@@ -59,43 +92,43 @@ def jira_issue_remove_unstable_data(issue: dict):
 
 # Convert Jira tables to markdown
 def jira_table_to_markdown(text):
+    # Without any '|' there is no table, only the empty lines are dropped
+    if '|' not in text:
+        return '\n'.join(line for line in text.splitlines() if line)
+
     lines = text.splitlines()
     # turn in-cell newlines into <br> and reconcatenate mistakenly broken rows
+    # (empty lines are dropped)
+    # In the same pass, change the ||-delimited header in to |-delimited
+    # and insert | --- | separator line
+    joined_lines = []
+    found_table = False
     i = 0
     l = len(lines)
     while i < l:
         j = 0
-        if lines[i] and lines[i][0] == '|':
-            while i+j < l-1 and lines[i][-1] != '|' :
+        line = lines[i]
+        if line and line[0] == '|':
+            row = [line]
+            while i+j < l-1 and not row[-1].endswith('|'):
                 j = j + 1
-                lines[i] = lines[i] + '<br>' + lines[i+j]
+                row.append(lines[i+j])
+            line = '<br>'.join(row)
             if i+j == l-1:
                 # We reached the end without finding a closing '|'. 
                 # Someting is wrong, we abort.
                 if not FORCE_REPAIR_JIRA_TABLES:
                     return text
-            for k in range(j):
-                lines[i+1+k] = None
+            if line[:2] == '||' and line[-2:] == '||':
+                found_table = True
+                pp = line.count('|') // 2
+                sep = '\n' + '| --- ' * (pp - 1) + '|'
+                line = line.replace('||', '|') + sep
+        if line:
+            joined_lines.append(line)
         i = i + j + 1
 
-    lines = list(filter(None, lines))
-    found_table = False
-
-    # Change the ||-delimited header in to |-delimited
-    # and insert | --- | separator line
-    for i in range(len(lines)):
-        if lines[i] and lines[i][:2] == '||' and lines[i][-2:] == '||':
-            found_table = True
-            pp = 0
-            p = 0
-            for c in lines[i]:
-                if c == '|':
-                    p += 1
-                    if p == 2:
-                        pp += 1
-                        p = 0
-            sep = '\n' + '| --- ' * (pp - 1) + '|'
-            lines[i] = re.sub(r'\|\|', r'|', lines[i]) + sep
+    lines = joined_lines
 
     # Try force repairing the broken table
     if FORCE_REPAIR_JIRA_TABLES and not found_table:
@@ -105,156 +138,236 @@ def jira_table_to_markdown(text):
         for i in range(l):
             if lines[i] and lines[i][:1] == '|' and lines[i][-1:] == '|':
                 found_broken_table = True
-                pp = 0
-                p = 0
-                for c in lines[i]:
-                    if c == '|':
-                        p += 1
-                        if p == 2:
-                            pp += 1
-                            p = 0
+                pp = lines[i].count('|') // 2
                 break
         if found_broken_table:
             sep = '\n' + '| --- ' * (pp * 2 - 1) + '|'
-            lines[i] = re.sub(r'\|\|', r'|', lines[i]) + sep
+            lines[i] = lines[i].replace('||', '|') + sep
 
     return '\n'.join(lines)
 
 
+# Emojis : https://emoji.codes
+JIRA_EMOJIS = {
+    ':)': ':smiley:',
+    ':(': ':disappointed:',
+    ':P': ':yum:',
+    ':D': ':grin:',
+    ';)': ':wink:',
+    '(y)': ':thumbsup:',
+    '(n)': ':thumbsdown:',
+    '(i)': ':information_source:',
+    '(/)': ':white_check_mark:',
+    '(x)': ':x:',
+    '(!)': ':warning:',
+    '(+)': ':heavy_plus_sign:',
+    '(-)': ':heavy_minus_sign:',
+    '(?)': ':grey_question:',
+    '(on)': ':bulb:',
+    # '(off)': ':', # Not found
+    '(*)': ':star:',
+    '(*r)': ':star:',
+    '(*g)': ':star:',
+    '(*b)': ':star:',
+    '(*y)': ':star:',
+}
+JIRA_EMOJIS_PATTERN = re.compile('|'.join(re.escape(e) for e in sorted(JIRA_EMOJIS, key=len, reverse=True)))
+
+# List items: up to two markers giving the depth, then '#' (ordered) or '*' / '-' (unordered)
+# A top-level item cannot be '- '
+JIRA_LIST_PATTERN = re.compile(r'\n *(?!- )([\*\-\#]{0,2})([\#\*\-]) ')
+
 # Gitlab markdown : https://docs.gitlab.com/ee/user/markdown.html
 # Jira text formatting notation : https://jira.atlassian.com/secure/WikiRendererHelpAction.jspa?section=all
+# The substitutions are compiled once, at import time, and applied in this order.
+# Each one comes with literals of which at least one must be in the text for it to match,
+# so that the (much slower) regex scan is skipped for text without that markup.
+# Links to other issues depend on the project, they are substituted in between the two lists.
+JIRA_MARKDOWN_SECTIONS_AND_LINKS = [
+    # Sections and links
+    (re.compile(r'(\r?\n){1}'), r'  \1', ('\n',)), # line breaks
+    (re.compile(r'\{code\}\s*'), r'\n```\n', ('{code}',)), # Block code (simple)
+    (re.compile(r'\{code:(\w+)(?:\|\w+=[\w.\-]+)*\}\s*'), r'\n```\1\n', ('{code:',)), # Block code (with language and properties)
+    (re.compile(r'\{code:[^}]*\}\s*'), r'\n```\n', ('{code:',)), # Block code (catch-all, bailout to simple)
+    (re.compile(r'\n\s*bq\. (.*)\n'), r'\n> \1\n', ('bq. ',)), # Block quote
+    (re.compile(r'\{quote\}'), r'\n>>>\n', ('{quote}',)), # Block quote #2
+    (re.compile(r'\{color:[\#\w]+\}(.*)\{color\}'), r'> **\1**', ('{color',)), # Colors
+    (re.compile(r'\n-{4,}\n'), r'---', ('----',)), # Ruler
+    (re.compile(r'\[~([a-z]+)\]'), r'@\1', ('[~',)), # Links to users
+    (re.compile(r'\[([^|\]]*)\]'), r'\1', ('[',)), # Links without alt
+    (re.compile(r'\[(?:(.+)\|)([a-z]+://.+)\]'), r'[\1](\2)', ('://',)), # Links with alt
+]
+JIRA_MARKDOWN_FORMATTING = [
+    # Lists, sub-lists and sub-sub-lists, in a single pass
+    (JIRA_LIST_PATTERN, lambda m: '\n' + ' ' * (1 + 2 * len(m.group(1))) + ('1. ' if m.group(2) == '#' else '- '), ('# ', '* ', '- ')),
+    # Text effects
+    (re.compile(r'(^|[\W])\*(\S.*\S)\*([\W]|$)'), r'\1**\2**\3', ('*',)), # Bold
+    (re.compile(r'(^|[\W])_(\S.*\S)_([\W]|$)'), r'\1*\2*\3', ('_',)), # Emphasis
+    (re.compile(r'(^|[\W])-([^\s\-\|].*[^\s\-\|])-([\W]|$)'), r'\1~~\2~~\3', ('-',)), # Deleted / Strikethrough
+    (re.compile(r'(^|[\W])\+(\S.*\S)\+([\W]|$)'), r'\1__\2__\3', ('+',)), # Underline
+    (re.compile(r'(^|[\W])\{\{([^}]*)\}\}([\W]|$)'), r'\1`\2`\3', ('{{',)), # Inline code
+    # Titles
+    (re.compile(r'\n?\bh([1-6])\. '), lambda m: '\n' + '#' * int(m.group(1)) + ' ', ('. ',)),
+    # Emojis, in a single pass
+    (JIRA_EMOJIS_PATTERN, lambda m: JIRA_EMOJIS[m.group(0)], (':', ';', '(')),
+]
+
+# Substitution of links to other issues of a Jira project
+# The pattern and its replacement are built once per project
+@functools.lru_cache(maxsize=None)
+def jira_issue_linker(jira_project):
+    pattern = re.compile(r'\b%s-\d+\b' % re.escape(jira_project))
+    return functools.partial(pattern.sub, r'[\g<0>](%s/browse/\g<0>)' % JIRA_URL)
+
+# Conversion of a Jira text, without the custom substitutions
+# The same texts come back often (e.g. canned or bot comments), so conversions are cached
+@functools.lru_cache(maxsize=4096)
+def jira_markup_to_markdown(jira_project, t):
+    # Tables
+    t = jira_table_to_markdown(t)
+
+    for pattern, replacement, sentinels in JIRA_MARKDOWN_SECTIONS_AND_LINKS:
+        if any(sentinel in t for sentinel in sentinels):
+            t = pattern.sub(replacement, t)
+    if f'{jira_project}-' in t:
+        t = jira_issue_linker(jira_project)(t) # Links to other issues
+    for pattern, replacement, sentinels in JIRA_MARKDOWN_FORMATTING:
+        if any(sentinel in t for sentinel in sentinels):
+            t = pattern.sub(replacement, t)
+
+    return t
+
 def jira_text_2_gitlab_markdown(jira_project, text, adict):
     if text is None:
         return ''
-    t = text
-
-    # Tables
-    t = jira_table_to_markdown(t)
+    t = jira_markup_to_markdown(jira_project, text)
 
-    # Sections and links
-    t = re.sub(r'(\r?\n){1}', r'  \1', t) # line breaks
-    t = re.sub(r'\{code\}\s*', r'\n```\n', t) # Block code (simple)
-    t = re.sub(r'\{code:(\w+)(?:\|\w+=[\w.\-]+)*\}\s*', r'\n```\1\n', t) # Block code (with language and properties)
-    t = re.sub(r'\{code:[^}]*\}\s*', r'\n```\n', t) # Block code (catch-all, bailout to simple)
-    t = re.sub(r'\n\s*bq\. (.*)\n', r'\n> \1\n', t) # Block quote
-    t = re.sub(r'\{quote\}', r'\n>>>\n', t) # Block quote #2
-    t = re.sub(r'\{color:[\#\w]+\}(.*)\{color\}', r'> **\1**', t) # Colors
-    t = re.sub(r'\n-{4,}\n', r'---', t) # Ruler
-    t = re.sub(r'\[~([a-z]+)\]', r'@\1', t) # Links to users
-    t = re.sub(r'\[([^|\]]*)\]', r'\1', t) # Links without alt
-    t = re.sub(r'\[(?:(.+)\|)([a-z]+://.+)\]', r'[\1](\2)', t) # Links with alt
-    t = re.sub(r'(\b%s-\d+\b)' % jira_project, r'[\1](%s/browse/\1)' % JIRA_URL, t) # Links to other issues
-    # Lists
-    t = re.sub(r'\n *\# ', r'\n 1. ', t) # Ordered list
-    t = re.sub(r'\n *[\*\-\#]\# ', r'\n   1. ', t) # Ordered sub-list
-    t = re.sub(r'\n *[\*\-\#]{2}\# ', r'\n     1. ', t) # Ordered sub-sub-list
-    t = re.sub(r'\n *\* ', r'\n - ', t) # Unordered list
-    t = re.sub(r'\n *[\*\-\#][\*\-] ', r'\n   - ', t) # Unordered sub-list
-    t = re.sub(r'\n *[\*\-\#]{2}[\*\-] ', r'\n     - ', t) # Unordered sub-sub-list
-    # Text effects
-    t = re.sub(r'(^|[\W])\*(\S.*\S)\*([\W]|$)', r'\1**\2**\3', t) # Bold
-    t = re.sub(r'(^|[\W])_(\S.*\S)_([\W]|$)', r'\1*\2*\3', t) # Emphasis
-    t = re.sub(r'(^|[\W])-([^\s\-\|].*[^\s\-\|])-([\W]|$)', r'\1~~\2~~\3', t) # Deleted / Strikethrough
-    t = re.sub(r'(^|[\W])\+(\S.*\S)\+([\W]|$)', r'\1__\2__\3', t) # Underline
-    t = re.sub(r'(^|[\W])\{\{([^}]*)\}\}([\W]|$)', r'\1`\2`\3', t) # Inline code
-    # Titles
-    t = re.sub(r'\n?\bh1\. ', r'\n# ', t)
-    t = re.sub(r'\n?\bh2\. ', r'\n## ', t)
-    t = re.sub(r'\n?\bh3\. ', r'\n### ', t)
-    t = re.sub(r'\n?\bh4\. ', r'\n#### ', t)
-    t = re.sub(r'\n?\bh5\. ', r'\n##### ', t)
-    t = re.sub(r'\n?\bh6\. ', r'\n###### ', t)
-    # Emojis : https://emoji.codes
-    t = re.sub(r':\)', r':smiley:', t)
-    t = re.sub(r':\(', r':disappointed:', t)
-    t = re.sub(r':P', r':yum:', t)
-    t = re.sub(r':D', r':grin:', t)
-    t = re.sub(r';\)', r':wink:', t)
-    t = re.sub(r'\(y\)', r':thumbsup:', t)
-    t = re.sub(r'\(n\)', r':thumbsdown:', t)
-    t = re.sub(r'\(i\)', r':information_source:', t)
-    t = re.sub(r'\(/\)', r':white_check_mark:', t)
-    t = re.sub(r'\(x\)', r':x:', t)
-    t = re.sub(r'\(!\)', r':warning:', t)
-    t = re.sub(r'\(\+\)', r':heavy_plus_sign:', t)
-    t = re.sub(r'\(-\)', r':heavy_minus_sign:', t)
-    t = re.sub(r'\(\?\)', r':grey_question:', t)
-    t = re.sub(r'\(on\)', r':bulb:', t)
-    #t = re.sub(r'\(off\)', r':', t) # Not found
-    t = re.sub(r'\(\*[rgby]?\)', r':star:', t)
-
-    # process custom substitutions
-    for k, v in adict.items():
-        t = re.sub(k, v, t)
+    # process custom substitutions (compiled patterns of attachments, which are all mentioned as !filename...!)
+    if '!' in t:
+        for pattern, v in adict.items():
+            t = pattern.sub(v, t)
     return t
 
 # Migrate a list of attachments
 # We use UUID in place of the filename to prevent 500 errors on unicode chars
 # The attachments need to be explicitly mentioned to be visible in Gitlab issues
+# Returns the replacements for comments mentioning them, and the uploads to record in the import status
 def move_attachments(attachments, gitlab_project_id):
-    replacements = {}
-    for attachment in attachments:
-        author = 'jira' # if user is not valid, use root
-        if 'author' in attachment:
-            author = attachment['author']['name']
-
-        clean_filename = ""
-        if KEEP_ORIGINAL_ATTACHMENT_FILENAMES:
-            filename = attachment["filename"]
-            # Try to clean up some unicode characters by stripping accents
-            n_chars = (c for c in unicodedata.normalize("NFD", filename) if unicodedata.category(c) != "Mn")
-            clean_filename = "".join(n_chars)
-
-        _file = requests.get(
-            attachment['content'],
-            auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-            verify = VERIFY_SSL_CERTIFICATE,
-        )
-        if not _file:
-            print(f"[WARN] Unable to migrate attachment: {attachment['content']} ... ")
+    # Attachments are moved ATTACHMENT_WORKERS at a time, the replacements are kept in their original order
+    executor = ThreadPoolExecutor(max_workers=ATTACHMENT_WORKERS)
+    try:
+        moved = list(executor.map(lambda attachment: move_attachment(attachment, gitlab_project_id), attachments))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    replacements = dict()
+    uploads = dict()
+    for attachment, full_file_path in zip(attachments, moved):
+        if full_file_path is None:
             continue
+        # Add this to replacements for comments mentioning these attachments
+        # The pattern is compiled once, it is applied to the description and to every comment and worklog of the issue
+        key = re.compile(rf"!{re.escape(attachment['filename'])}[^!]*!")
+        replacements[key] = rf"![{attachment['filename']}]({full_file_path})"
+        uploads[attachment['content']] = [gitlab_project_id, full_file_path]
+    return replacements, uploads
+
+# Try to clean up some unicode characters by stripping accents
+# The same file names (e.g. screenshots) come back often
+@functools.lru_cache(maxsize=4096)
+def clean_attachment_filename(filename):
+    n_chars = (c for c in unicodedata.normalize("NFD", filename) if unicodedata.category(c) != "Mn")
+    return "".join(n_chars)
+
+# Migrate an attachment
+# Returns the full path of the uploaded file, or None if it could not be migrated
+def move_attachment(attachment, gitlab_project_id):
+    # Attachments uploaded by an earlier import of the issue are not transferred again
+    uploaded = import_status['attachment_uploads'].get(attachment['content'])
+    if uploaded and uploaded[0] == gitlab_project_id:
+        return uploaded[1]
+
+    author = 'jira' # if user is not valid, use root
+    if 'author' in attachment:
+        author = attachment['author']['name']
+
+    clean_filename = ""
+    if KEEP_ORIGINAL_ATTACHMENT_FILENAMES:
+        clean_filename = clean_attachment_filename(attachment["filename"])
+
+    # The download is streamed and handed over to the upload as a file object,
+    # without first copying the whole attachment in a separate buffer
+    # Errors still left after the session retries only skip this attachment.
+    try:
+        with jira_session.get(attachment['content'], stream=True) as _file:
+            if not _file:
+                print(f"[WARN] Unable to migrate attachment: {attachment['content']} ... ")
+                return None
 
-        _content = BytesIO(_file.content)
+            _file.raw.decode_content = True
 
-        file_data = (clean_filename, _content) if KEEP_ORIGINAL_ATTACHMENT_FILENAMES \
-            else (str(uuid.uuid4()), _content)  # Use a UUID as file name
+            file_data = (clean_filename, _file.raw) if KEEP_ORIGINAL_ATTACHMENT_FILENAMES \
+                else (str(uuid.uuid4()), _file.raw)  # Use a UUID as file name
 
-        file_info = requests.post(
-            f'{GITLAB_API}/projects/{gitlab_project_id}/uploads',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN,'Sudo': resolve_login(author)['username']},
-            files = {'file': file_data},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
-        del _content
+            file_info = gitlab_session.post(
+                f'{GITLAB_API}/projects/{gitlab_project_id}/uploads',
+                headers = {'Sudo': resolve_login(author)['username']},
+                files = {'file': file_data}
+            )
+    except requests.exceptions.RequestException as e:
+        print(f"[WARN] Unable to migrate attachment: {attachment['content']} ... \n{e}")
+        return None
 
-        if not file_info:
-            print(f"[WARN] Unable to migrate attachment: {attachment['content']} ... ")
-            continue
+    if not file_info:
+        print(f"[WARN] Unable to migrate attachment: {attachment['content']} ... ")
+        return None
 
-        file_info = file_info.json()
+    file_info = file_info.json()
 
-        # Add this to replacements for comments mentioning these attachments
-        key = rf"!{re.escape(attachment['filename'])}[^!]*!"
-        # Use full path to avoid problems for epics/issues
-        full_file_path = f"{GITLAB_URL}{file_info['full_path']}"
-        value = rf"![{attachment['filename']}]({full_file_path})"
+    # Use full path to avoid problems for epics/issues
+    return f"{GITLAB_URL}{file_info['full_path']}"
 
-        replacements[key] = value
-    return replacements
+# Get all items of a paginated Gitlab API list
+# When the first page tells the number of pages, the others are fetched concurrently.
+# Otherwise (x-total-pages is not returned by Gitlab for very large lists),
+# pages are followed with the x-next-page header, which is empty on the last page.
+def gitlab_get_all(path, params=None):
+    def get_page(page):
+        rq = gitlab_session.get(f'{GITLAB_API}{path}', params={**(params or {}), 'per_page': 100, 'page': page})
+        rq.raise_for_status()
+        return rq
+
+    rq = get_page(1)
+    items = rq.json()
+    if rq.headers.get('x-total-pages'):
+        executor = ThreadPoolExecutor(max_workers=GITLAB_PAGE_WORKERS)
+        try:
+            for rq in executor.map(get_page, range(2, int(rq.headers['x-total-pages']) + 1)):
+                if interrupted.is_set():
+                    raise SigIntException
+                items.extend(rq.json())
+        finally:
+            executor.shutdown(cancel_futures=True)
+        return items
+
+    page = rq.headers.get('x-next-page')
+    while page:
+        if interrupted.is_set():
+            raise SigIntException
+        rq = get_page(page)
+        items.extend(rq.json())
+        page = rq.headers.get('x-next-page')
+    return items
 
 # Get the ID of a Gitlab milestone name
+# gl_milestones is the local cache of the project's milestones, indexed by title
 def get_milestone_id(gl_milestones, gitlab_project_id, title):
-    for milestone in gl_milestones:
-        if milestone['title'] == title:
-            return milestone['id']
+    if title in gl_milestones:
+        return gl_milestones[title]['id']
     
     # Milestone not found in local cache, check in Gitlab
     try:
-        milestones = requests.get(
-            f'{GITLAB_API}/projects/{gitlab_project_id}/milestones?title={title}',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
+        milestones = gitlab_session.get(f'{GITLAB_API}/projects/{gitlab_project_id}/milestones?title={title}')
         milestones.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise Exception(f"Unable to search milestone {title} in Gitlab\n{e}")
@@ -265,17 +378,15 @@ def get_milestone_id(gl_milestones, gitlab_project_id, title):
         milestone = milestones[0]
     else:
         # Milestone doesn't exist in Gitlab, we create it
-        milestone = requests.post(
+        milestone = gitlab_session.post(
             f'{GITLAB_API}/projects/{gitlab_project_id}/milestones',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE,
             json = { 'title': title }
         )
         if not milestone:
             raise Exception(f"Could not add milestone {title} in Gitlab")
         milestone = milestone.json()
 
-    gl_milestones.append(milestone)
+    gl_milestones[title] = milestone
     return milestone['id']
 
 # Change admin role of Gitlab users
@@ -285,10 +396,8 @@ def gitlab_user_admin(user, admin):
         return user
 
     try:
-        gl_user = requests.put(
+        gl_user = gitlab_session.put(
             f"{GITLAB_API}/users/{user['id']}",
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE,
             json = { 'admin': admin }
         )
         gl_user.raise_for_status()
@@ -304,38 +413,45 @@ def gitlab_user_admin(user, admin):
     return gl_user
 
 # Find or create the Gitlab user corresponding to the given Jira user
+# Issues are prepared in worker threads, so users are resolved (and created) under a lock
+# Jira users resolved to their own Gitlab user are remembered, and found again without the lock.
+# The others are never remembered, as they are counted each time for the final report.
 def resolve_login(jira_username):
-    if jira_username == 'jira':
-        return gl_users[GITLAB_ADMIN]
+    gl_user = resolved_logins.get(jira_username)
+    if gl_user:
+        return gl_user
+
+    with gl_users_lock:
+        if jira_username == 'jira':
+            return gl_users[GITLAB_ADMIN]
 
-    # Mapping found
-    if jira_username in USER_MAP:
-        gl_username = USER_MAP[jira_username]
+        # Mapping found
+        if jira_username in USER_MAP:
+            gl_username = USER_MAP[jira_username]
     
-        # User exists in Gitlab
-        if gl_username in gl_users:
-            gl_user = gl_users[gl_username]
-            if MAKE_USERS_TEMPORARILY_ADMINS and not gl_users[gl_username]['is_admin']:
-                gl_user = gitlab_user_admin(gl_users[gl_username], True)
-            return gl_user
-
-        # User doesn't exist in Gitlab, migrate it if allowed
-        if MIGRATE_USERS:
-            return migrate_user(jira_username)
+            # User exists in Gitlab
+            # Once made admin, the user is kept as such in gl_users, so that it is only changed once
+            if gl_username in gl_users:
+                gl_user = gl_users[gl_username]
+                if MAKE_USERS_TEMPORARILY_ADMINS and not gl_user['is_admin']:
+                    gl_user = gitlab_user_admin(gl_user, True)
+                    gl_users[gl_username] = gl_user
+                resolved_logins[jira_username] = gl_user
+                return gl_user
+
+            # User doesn't exist in Gitlab, migrate it if allowed
+            if MIGRATE_USERS:
+                gl_user = migrate_user(jira_username)
+                resolved_logins[jira_username] = gl_user
+                return gl_user
     
-        # Not allowed to migrate the user, log it
-        if gl_username in gl_users_not_migrated:
+            # Not allowed to migrate the user, log it
             gl_users_not_migrated[gl_username] += 1
-        else:
-            gl_users_not_migrated[gl_username] = 1
-        return gl_users[GITLAB_ADMIN]
+            return gl_users[GITLAB_ADMIN]
 
-    # No mapping found, log jira user
-    if jira_username in jira_users_not_mapped:
+        # No mapping found, log jira user
         jira_users_not_mapped[jira_username] += 1
-    else:
-        jira_users_not_mapped[jira_username] = 1
-    return gl_users[GITLAB_ADMIN]
+        return gl_users[GITLAB_ADMIN]
 
 
 # Migrate a user
@@ -346,22 +462,15 @@ def migrate_user(jira_username):
         return gl_users[GITLAB_ADMIN]
 
     try:
-        jira_user = requests.get(
-            f'{JIRA_API}/user?username={jira_username}',
-            auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-            verify = VERIFY_SSL_CERTIFICATE,
-            headers = {'Content-Type': 'application/json'}
-        )
+        jira_user = jira_session.get(f'{JIRA_API}/user?username={jira_username}')
         jira_user.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise Exception(f"Unable to read {jira_username} from Jira!\n{e}")
     jira_user = jira_user.json()
 
     try:
-        gl_user = requests.post(
+        gl_user = gitlab_session.post(
             f'{GITLAB_API}/users',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE,
             json = {
                 'admin': MAKE_USERS_TEMPORARILY_ADMINS,
                 'email': jira_user['emailAddress'],
@@ -393,10 +502,8 @@ def create_gl_project(gitlab_project):
         raise Exception(f'Could not find namespace {namespace} in Gitlab!')
 
     try:
-        gl_project = requests.post(
+        gl_project = gitlab_session.post(
             f'{GITLAB_API}/projects',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE,
             json = {
                 'path': project,
                 'namespace_id': namespace_id,
@@ -408,15 +515,374 @@ def create_gl_project(gitlab_project):
         raise Exception(f"Unable to create {gitlab_project} in Gitlab!\n{e}")
     return gl_project.json()['id']
 
+# Get the summary of a Jira epic
+# Epics of the project being imported are already known from its issues (see migrate_project),
+# epics of other projects are fetched once
+def get_epic_summary(epic_id):
+    if epic_id not in epic_summaries:
+        epic_info = jira_session.get(f"{JIRA_API}/issue/{epic_id}/?fields=summary").json()
+        epic_summaries[epic_id] = epic_info['fields']['summary']
+    return epic_summaries[epic_id]
+
+# Get notes referencing the BitBucket commits of a Jira issue
+# Only the references to repos mapped in PROJECTS_BITBUCKET are added
+# Note: this an internal call, it is not part of the public API. (https://jira.atlassian.com/browse/JSWCLOUD-16901)
+def get_commit_notes(issue):
+    try:
+        devel_info = jira_session.get(
+            f"{JIRA_URL}/rest/dev-status/latest/issue/detail?issueId={issue['id']}&applicationType=stash&dataType=repository",
+            timeout = 60 # I've seen this call hang indefinitely. Use a timeout to prevent that.
+        )
+        devel_info.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Unable to get the development information of {issue['key']} from Jira!\n{e}")
+    devel_info = devel_info.json()
+
+    commit_notes = []
+    for detail in devel_info['detail']:
+        for repository in detail['repositories']:
+            for commit in repository['commits']:
+                match = BITBUCKET_COMMIT_PATTERN.match(commit['url'])
+                if match is None:
+                    continue
+                bitbucket_ref = f"{match.group(1)}/{match.group(2)}"
+                gitlab_repo = PROJECTS_BITBUCKET.get(bitbucket_ref)
+                if gitlab_repo is None:
+                    continue
+                commit_reference = f"[{commit['displayId']} in {bitbucket_ref}]({GITLAB_URL}/{gitlab_repo}/-/commit/{commit['id']})"
+                body = f"{commit['author']['name']} commited {commit_reference} : {commit['message']}"
+                commit_notes.append((None, {
+                    'created_at': commit['authorTimestamp'],
+                    'body': body
+                }))
+    return commit_notes
+
+# Fetch the parts of a Jira issue that don't depend on other issues: the epic name, the attachments
+# and the references to BitBucket commits.
+# Attachments are uploaded to the Gitlab project, and replacements for comments pointing at them are returned.
+# The description, comments and worklogs are converted to markdown as well.
+# This runs in worker threads, for several issues at a time.
+def prepare_issue(jira_project, issue, gitlab_project_id):
+    # Epic name
+    epic_summary = None
+    if JIRA_EPIC_FIELD in issue['fields'] and issue['fields'][JIRA_EPIC_FIELD]:
+        epic_summary = get_epic_summary(issue['fields'][JIRA_EPIC_FIELD]['id'])
+
+    # Migrate attachments and get replacements for comments pointing at them
+    replacements = dict()
+    uploads = dict()
+    if MIGRATE_ATTACHMENTS and 'attachment' in issue['fields']:
+        replacements, uploads = move_attachments(issue['fields']['attachment'], gitlab_project_id)
+
+    # Markdown of the description, comments and worklogs (not all worklogs have a comment)
+    markdown = {
+        'description': jira_text_2_gitlab_markdown(jira_project, issue['fields']['description'], replacements),
+        'comments': [jira_text_2_gitlab_markdown(jira_project, comment['body'], replacements)
+                     for comment in issue['fields']['comment']['comments']],
+    }
+    if MIGRATE_WORLOGS:
+        markdown['worklogs'] = [jira_text_2_gitlab_markdown(jira_project, worklog['comment'], replacements) if "comment" in worklog else ""
+                                for worklog in issue['fields']['worklog']['worklogs']]
+
+    # Notes referencing BitBucket commits
+    commit_notes = []
+    if REFERECE_BITBUCKET_COMMITS:
+        commit_notes = get_commit_notes(issue)
+
+    return epic_summary, replacements, uploads, markdown, commit_notes
+
+# Prepare issues in the executor's worker threads, up to 2*ISSUE_WORKERS issues ahead of the one being imported.
+# Yields the issues in their original order, together with their preparation.
+def prepare_issues(executor, jira_project, issues_todo, gitlab_project_id):
+    prepared = deque()
+    for todo in issues_todo:
+        # Don't start preparing more issues once interrupted
+        if interrupted.is_set():
+            raise SigIntException
+        prepared.append((todo, executor.submit(prepare_issue, jira_project, todo[1], gitlab_project_id)))
+        if len(prepared) > 2 * ISSUE_WORKERS:
+            todo, future = prepared.popleft()
+            yield todo, future.result()
+    for todo, future in prepared:
+        yield todo, future.result()
+
+# Add notes to a Gitlab issue, NOTE_WORKERS at a time
+# Notes are given as (Sudo user or None, note). Gitlab orders them by their created_at, not by insertion.
+def add_notes(gitlab_project_id, gl_issue, notes):
+    def add_note(note):
+        (gl_author, data) = note
+        note_add = gitlab_session.post(
+            f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}/notes",
+            headers = {'Sudo': gl_author} if gl_author else None,
+            json = data
+        )
+        note_add.raise_for_status()
+
+    executor = ThreadPoolExecutor(max_workers=NOTE_WORKERS)
+    try:
+        # Raises the first failure, if any
+        for _ in executor.map(add_note, notes):
+            pass
+    finally:
+        # Don't add the remaining notes after a failure, the issue is removed anyway
+        executor.shutdown(cancel_futures=True)
+
+# Header of the note listing the custom fields of an issue
+CUSTOM_FIELDS_TABLE_HEADER = "| Additional metadata | Content |\n| - | - |\n"
+
+# Migrate a Jira issue, prepared by prepare_issue
+def migrate_issue(gitlab_project_id, gl_milestones, issue, issue_hash, epic_summary, replacements, uploads, markdown, commit_notes, progress):
+    fields = issue['fields']
+    weight = None
+
+    # Delete issues that were imported before, but have changed
+    if issue['key'] in import_status['issue_mapping']:
+        print(f"[INFO] {progress} Jira issue {issue['key']} was imported before, but it has changed. Deleting and re-importing.", flush=True)
+        # A failed delete leaves the old copy in Gitlab, but doesn't stop the import
+        try:
+            gitlab_session.delete(f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{import_status['issue_mapping'][issue['key']][0]['iid']}")
+        except requests.exceptions.RequestException as e:
+            print(f"[WARN] Unable to delete the previous Gitlab issue of {issue['key']}\n{e}")
+    else:
+        print(f"\r[INFO] {progress} Migrating Jira issue {issue['key']} ...   ", end='', flush=True)
+
+    # Reporter
+    reporter = 'jira' # if no reporter is available, use root
+    if ('reporter' in fields and
+         fields['reporter'] and
+        'name' in fields['reporter']):
+        reporter = fields['reporter']['name']
+
+    # Assignee (can be empty)
+    gl_assignee = None
+    if fields['assignee']:
+        gl_assignee = [resolve_login(fields['assignee']['name'])['id']]
+
+    # Labels are collected in a set, as e.g. components and statuses may map to the same label
+    # Mark all issues as imported
+    gl_labels = {"jira-import"}
+
+    # Migrate existing labels
+    if 'labels' in fields:
+        gl_labels.update(PREFIX_LABEL + sub for sub in fields['labels'])
+
+    # Issue type to label
+    if fields['issuetype']['name'] in ISSUE_TYPE_MAP:
+        gl_labels.add(ISSUE_TYPE_MAP[fields['issuetype']['name']])
+    else:
+        print(f"\n[WARN] Jira issue type {fields['issuetype']['name']} not mapped. Importing as generic label.", flush=True)
+        gl_labels.add(fields['issuetype']['name'].lower())
+
+    # Priority to label
+    if 'priority' in fields:
+        if fields['priority'] and fields['priority']['name'] in ISSUE_PRIORITY_MAP:
+            gl_labels.add(ISSUE_PRIORITY_MAP[fields['priority']['name']])
+        else:
+            gl_labels.add(PREFIX_PRIORITY + fields['priority']['name'].lower())
+
+    # Issue components to labels
+    for component in fields['components']:
+        if component['name'] in ISSUE_COMPONENT_MAP:
+            gl_labels.add(ISSUE_COMPONENT_MAP[component['name']])
+        else:
+            gl_labels.add(PREFIX_COMPONENT + component['name'].lower())
+
+    # issue status to label
+    if fields['status'] and fields['status']['name'] in ISSUE_STATUS_MAP:
+        gl_labels.add(ISSUE_STATUS_MAP[fields['status']['name']])
+
+    # Resolution is also mapped into a status
+    if fields['resolution'] and fields['resolution']['name'] in ISSUE_RESOLUTION_MAP:
+        gl_labels.add(ISSUE_RESOLUTION_MAP[fields['resolution']['name']])
+
+    # storypoints / weight
+    if JIRA_STORY_POINTS_FIELD in fields and fields[JIRA_STORY_POINTS_FIELD]:
+        weight = int(fields[JIRA_STORY_POINTS_FIELD])
+
+    # Epic name to label
+    if epic_summary:
+        gl_labels.add(epic_summary)
+
+    # Last fix versions to milestone
+    gl_milestone_id = None
+    for fixVersion in fields['fixVersions']:
+        gl_milestone_id = get_milestone_id(gl_milestones, gitlab_project_id, fixVersion['name'])
+
+    # Collect issue links, to be processed after all Gitlab issues are created
+    # Only "outward" links were collected.
+    # I.e. we only need to process (a blocks b), as (b blocked by a) comes implicitly.
+    issue_links = set()
+    for link in fields['issuelinks']:
+        if 'outwardIssue' in link:
+            issue_links.add( (issue['key'], link['type']['outward'], link['outwardIssue']['key']) )
+
+    # There is no sub-task equivalent in Gitlab
+    # Use a (sub-task, blocks, task) link instead
+    for subtask in fields['subtasks']:
+        issue_links.add( (subtask['key'], "blocks", issue['key']) )
+    import_status['links_todo'] |= issue_links
+
+    # Create Gitlab issue
+    # Add a link to the Jira issue and mention all attachments in the description
+    gl_description = markdown['description']
+    gl_description += "\n\n___\n\n"
+    gl_description += f"**Imported from Jira issue [{issue['key']}]({JIRA_URL}/browse/{issue['key']})**\n\n"
+
+    gl_reporter = resolve_login(reporter)['username']
+    if gl_reporter == GITLAB_ADMIN and reporter != 'jira':
+        gl_description += f"**Original creator of the issue: Jira user {reporter}**\n\n"
+
+    # Mention the attachments that the description doesn't show, appended at once
+    if MIGRATE_ATTACHMENTS:
+        mentioned = set()
+        attachment_mentions = []
+        for attachment in replacements.values():
+            if attachment not in mentioned and attachment not in gl_description:
+                mentioned.add(attachment)
+                attachment_mentions.append(f"Attachment imported from Jira issue [{issue['key']}]({JIRA_URL}/browse/{issue['key']}): {attachment}\n\n")
+        gl_description += ''.join(attachment_mentions)
+
+    try:
+        gl_title = ""
+        if ADD_JIRA_KEY_TO_TITLE:
+            gl_title = f"[{issue['key']}] "
+        gl_title += f"{fields['summary']}"
+        original_title = ""
+
+        if len(gl_title) > 255:
+            # add full original title as a comment later on
+            original_title = f"Full original title:\n\n{gl_title}\n\n"
+            gl_title = gl_title[:252] + '...'
+
+        data = {
+            'created_at': fields['created'],
+            'assignee_ids': gl_assignee,
+            'title': gl_title,
+            'description': original_title + gl_description,
+            'milestone_id': gl_milestone_id,
+            'labels': ", ".join(sorted(gl_labels)),
+        }
+        if weight is not None:
+            data['weight'] = weight
+
+        gl_issue = gitlab_session.post(
+            f"{GITLAB_API}/projects/{gitlab_project_id}/issues",
+            headers = {'Sudo': gl_reporter},
+            json = data
+        )
+        gl_issue.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"data: {data} ... ")
+        raise Exception(f"Unable to create Gitlab issue for Jira issue {issue['key']}\n{e}")
+    gl_issue = gl_issue.json()
+
+    # Collect Jira-Gitlab ID mapping and Jira issue hash
+    # to be used later for links and for incremental imports
+    import_status['issue_mapping'][issue['key']] = ({
+        'id': gl_issue['id'],
+        'project_id': gl_issue['project_id'],
+        'iid': gl_issue['iid'],
+        'full_ref': gl_issue['references']['full']
+    }, issue_hash)
+
+    # The Gitlab issue is created, now we add more information
+    # If anything after this point fails, we remove the issue to avoid half-imported issues
+    try:
+        # Notes are collected as (Sudo user, note) and added all together at the end
+        notes = []
+
+        # Add original comments
+        for comment, comment_markdown in zip(fields['comment']['comments'], markdown['comments']):
+            author = comment['author']['name']
+            gl_author = resolve_login(author)['username']
+            notice = ""
+            if gl_author == GITLAB_ADMIN and author != 'jira':
+                notice = f"[ Original comment made by Jira user {author} ]\n\n"
+
+            notes.append((gl_author, {
+                'created_at': comment['created'],
+                'body': notice + comment_markdown
+            }))
+
+        # migrate custom fields
+        custom_fields_rows = []
+        for key, desc in JIRA_CUSTOM_FIELDS.items():
+            field_value = fields.get(key)
+            if field_value:
+                field_value = str(field_value).replace('\n', "<br>")
+                custom_fields_rows.append(f'| {desc} | {field_value} |\n')
+        custom_fields_comment = ''.join(custom_fields_rows)
+
+        if custom_fields_comment:
+            gl_author = GITLAB_ADMIN
+            notes.append((gl_author, {
+                'body': CUSTOM_FIELDS_TABLE_HEADER + custom_fields_comment
+            }))
+
+        # Add worklogs
+        if MIGRATE_WORLOGS:
+            for worklog, worklog_comment in zip(fields['worklog']['worklogs'], markdown['worklogs']):
+                author = worklog['author']['name']
+                gl_author = resolve_login(author)['username']
+                if gl_author == GITLAB_ADMIN and author != 'jira':
+                    body = f"[ Worklog {worklog['timeSpent']} (Original worklog by Jira user {author}) ]\n\n"
+                else:
+                    body = f"[ Worklog {worklog['timeSpent']} ]\n\n"
+                body += worklog_comment
+                body += f"\n/spend {worklog['timeSpent']} {worklog['started'][:10]}"
+                notes.append((gl_author, {
+                    'created_at': worklog['started'],
+                    'body': body
+                }))
+
+        # Add comments to reference BitBucket commits (fetched by prepare_issue)
+        notes.extend(commit_notes)
+
+        add_notes(gitlab_project_id, gl_issue, notes)
+
+        # Close "done" issues
+        # status-category can only be "new" (To Do) / "indeterminate" (In Progress) / "done" (Done) / "undefined" (Undefined)
+        if fields['status']['statusCategory']['key'] == "done" or fields['status']['name'] in ISSUE_STATUS_CLOSED:
+            data = { 'state_event': 'close' }
+            if fields['resolutiondate']:
+                data['updated_at'] = fields['resolutiondate']
+            status = gitlab_session.put(
+                f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}",
+                json = data
+            )
+            status.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"{e}\n")
+
+        try:
+            gitlab_session.delete(f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}")
+        except requests.exceptions.RequestException as delete_error:
+            print(f"[WARN] Unable to remove Gitlab issue {gl_issue['id']}\n{delete_error}")
+        raise Exception(f"Unable to modify Gitlab issue {gl_issue['id']}. Removing issue and aborting.\n{e}")
+
+    # Issue successfully imported.
+    # Write current status to file
+    import_status['attachment_uploads'].update(uploads)
+    journal_import_status(issue['key'], issue_links, uploads)
+
+# Get a page of the issues of a Jira project
+# Note: the fields must stay the same across imports, as they are part of the issue hash.
+def jira_search_page(jira_project, start_at):
+    query = (f'{JIRA_API}/search?jql=project="{jira_project}" '
+             f'ORDER BY key&fields=*navigable,attachment,comment,'
+             f'worklog&maxResults={str(JIRA_PAGINATION_SIZE)}&startAt={start_at}')
+    try:
+        jira_issues_batch = jira_session.get(query)
+        jira_issues_batch.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Unable to query {query} in Jira!\n{e}")
+    return jira_issues_batch.json()
+
 # Migrate a project
 def migrate_project(jira_project, gitlab_project):
     # Get the project ID, create it if necessary.
     try:
-        project = requests.get(
-            f"{GITLAB_API}/projects/{urllib.parse.quote(gitlab_project, safe='')}",
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
+        project = gitlab_session.get(f"{GITLAB_API}/projects/{urllib.parse.quote(gitlab_project, safe='')}")
         project.raise_for_status()
         gitlab_project_id = project.json()['id']
     except requests.exceptions.RequestException:
@@ -424,417 +890,263 @@ def migrate_project(jira_project, gitlab_project):
 
     # Load the Gitlab project's milestone list (empty for a new import)
     try:
-        gl_milestones = requests.get(
-            f'{GITLAB_API}/projects/{gitlab_project_id}/milestones',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
-        gl_milestones.raise_for_status()
+        gl_milestones = gitlab_get_all(f'/projects/{gitlab_project_id}/milestones')
     except requests.exceptions.RequestException as e:
         raise Exception(f"Unable to list Gitlab milestones for project {gitlab_project}!\n{e}")
-    gl_milestones = gl_milestones.json()
+    gl_milestones = {milestone['title']: milestone for milestone in gl_milestones}
 
     # Load Jira project issues, with pagination (Jira has a limit on returned items)
     # This assumes they will all fit in memory
-    start_at = 0
-    jira_issues = []
-    while True:
-        query = (f'{JIRA_API}/search?jql=project="{jira_project}" '
-                 f'ORDER BY key&fields=*navigable,attachment,comment,'
-                 f'worklog&maxResults={str(JIRA_PAGINATION_SIZE)}&startAt={start_at}')
+    # Attachments, comments and worklogs come with the search results, no extra call per issue is needed.
+    # The first page tells us the total number of issues, and the page size actually granted
+    # by the server (Jira may cap maxResults). The remaining pages are fetched concurrently.
+    first_page = jira_search_page(jira_project, 0)
+    jira_issues = first_page['issues']
+    print(f"\r[INFO] Loading Jira issues from project {jira_project} ... {len(jira_issues)}", end='', flush=True)
+
+    page_size = first_page.get('maxResults') or JIRA_PAGINATION_SIZE
+    total = first_page.get('total')
+    page = first_page
+    if total is not None:
+        executor = ThreadPoolExecutor(max_workers=JIRA_SEARCH_WORKERS)
         try:
-            jira_issues_batch = requests.get(
-                query,
-                auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-                verify = VERIFY_SSL_CERTIFICATE,
-                headers = {'Content-Type': 'application/json'}
-            )
-            jira_issues_batch.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Unable to query {query} in Jira!\n{e}")
-        jira_issues_batch = jira_issues_batch.json()['issues']
-        if not jira_issues_batch:
-            break
-
-        start_at = start_at + len(jira_issues_batch)
-        jira_issues.extend(jira_issues_batch)
-        print(f"\r[INFO] Loading Jira issues from project {jira_project} ... {str(start_at)}", end='', flush=True)
+            pages = executor.map(lambda start_at: jira_search_page(jira_project, start_at),
+                                 range(len(jira_issues), total, page_size))
+            for page in pages:
+                if interrupted.is_set():
+                    raise SigIntException
+                jira_issues.extend(page['issues'])
+                print(f"\r[INFO] Loading Jira issues from project {jira_project} ... {len(jira_issues)}", end='', flush=True)
+                # A short page before the total means the offsets no longer match the issues
+                # (e.g. issues were created or deleted during the load), the rest is loaded one page at a time
+                if len(page['issues']) < page_size and len(jira_issues) < total:
+                    break
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    # Without a total, or when the pages did not add up to it, load one page after the other until an empty one.
+    # A full last page may also be followed by issues created during the load.
+    if total is None or len(jira_issues) < total or len(page['issues']) == page_size:
+        while True:
+            if interrupted.is_set():
+                raise SigIntException
+            page = jira_search_page(jira_project, len(jira_issues))
+            if not page['issues']:
+                break
+            jira_issues.extend(page['issues'])
+            print(f"\r[INFO] Loading Jira issues from project {jira_project} ... {len(jira_issues)}", end='', flush=True)
     print("\n")
 
-    # Import issues into Gitlab
+    # The summaries of the epics of this project come with its issues
+    epic_summaries.update((issue['id'], issue['fields']['summary']) for issue in jira_issues)
+
+    # Skip issues that were already imported and have not changed
+    issues_todo = []
     for index, issue in enumerate(jira_issues, start=1):
         jira_issue_remove_unstable_data(issue)
         issue_hash = dict_hash(issue)
-        weight = None
-        replacements = dict()
-
-        # Skip issues that were already imported and have not changed
-        if issue['key'] in import_status['issue_mapping']:
-            if import_status['issue_mapping'][issue['key']][1] == issue_hash:
-                print(f"[INFO] Issue {issue['key']} found in status with the same hash: previously imported and not changed.", flush=True)
-                continue
-            else:
-                print(f"[INFO] #{index}/{len(jira_issues)} Jira issue {issue['key']} was imported before, but it has changed. Deleting and re-importing.", flush=True)
-                requests.delete(
-                    f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{import_status['issue_mapping'][issue['key']][0]['iid']}",
-                    headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                    verify = VERIFY_SSL_CERTIFICATE,
-                )
-        else:
-            print(f"\r[INFO] #{index}/{len(jira_issues)} Migrating Jira issue {issue['key']} ...   ", end='', flush=True)
-
-        # Reporter
-        reporter = 'jira' # if no reporter is available, use root
-        if ('reporter' in issue['fields'] and
-             issue['fields']['reporter'] and
-            'name' in issue['fields']['reporter']):
-            reporter = issue['fields']['reporter']['name']
-
-        # Assignee (can be empty)
-        gl_assignee = None
-        if issue['fields']['assignee']:
-            gl_assignee = [resolve_login(issue['fields']['assignee']['name'])['id']]
-
-        # Mark all issues as imported
-        gl_labels = ["jira-import"]
-
-        # Migrate existing labels
-        if 'labels' in issue['fields']:
-            gl_labels.extend([PREFIX_LABEL + sub for sub in issue['fields']['labels']])
-
-        # Issue type to label
-        if issue['fields']['issuetype']['name'] in ISSUE_TYPE_MAP:
-            gl_labels.append(ISSUE_TYPE_MAP[issue['fields']['issuetype']['name']])
-        else:
-            print(f"\n[WARN] Jira issue type {issue['fields']['issuetype']['name']} not mapped. Importing as generic label.", flush=True)
-            gl_labels.append(issue['fields']['issuetype']['name'].lower())
-
-        # Priority to label
-        if 'priority' in issue['fields']:
-            if issue['fields']['priority'] and issue['fields']['priority']['name'] in ISSUE_PRIORITY_MAP:
-                gl_labels.append(ISSUE_PRIORITY_MAP[issue['fields']['priority']['name']])
-            else:
-                gl_labels.append(PREFIX_PRIORITY + issue['fields']['priority']['name'].lower())
-
-        # Issue components to labels
-        for component in issue['fields']['components']:
-            if component['name'] in ISSUE_COMPONENT_MAP:
-                gl_labels.append(ISSUE_COMPONENT_MAP[component['name']])
-            else:
-                gl_labels.append(PREFIX_COMPONENT + component['name'].lower())
-
-        # issue status to label
-        if issue['fields']['status'] and issue['fields']['status']['name'] in ISSUE_STATUS_MAP:
-            gl_labels.append(ISSUE_STATUS_MAP[issue['fields']['status']['name']])
-
-        # Resolution is also mapped into a status
-        if issue['fields']['resolution'] and issue['fields']['resolution']['name'] in ISSUE_RESOLUTION_MAP:
-            gl_labels.append(ISSUE_RESOLUTION_MAP[issue['fields']['resolution']['name']])
-
-        # storypoints / weight
-        if JIRA_STORY_POINTS_FIELD in issue['fields'] and issue['fields'][JIRA_STORY_POINTS_FIELD]:
-            weight = int(issue['fields'][JIRA_STORY_POINTS_FIELD])
-
-        # Epic name to label
-        if JIRA_EPIC_FIELD in issue['fields'] and issue['fields'][JIRA_EPIC_FIELD]:
-            epic_info = requests.get(
-                f"{JIRA_API}/issue/{issue['fields'][JIRA_EPIC_FIELD]['id']}/?fields=summary",
-                auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-                verify = VERIFY_SSL_CERTIFICATE,
-                headers = {'Content-Type': 'application/json'}
-            ).json()
-            gl_labels.append(epic_info['fields']['summary'])
-
-        # Last fix versions to milestone
-        gl_milestone_id = None
-        for fixVersion in issue['fields']['fixVersions']:
-            gl_milestone_id = get_milestone_id(gl_milestones, gitlab_project_id, fixVersion['name'])
-
-        # Collect issue links, to be processed after all Gitlab issues are created
-        # Only "outward" links were collected.
-        # I.e. we only need to process (a blocks b), as (b blocked by a) comes implicitly.
-        for link in issue['fields']['issuelinks']:
-            if 'outwardIssue' in link:
-                import_status['links_todo'].add( (issue['key'], link['type']['outward'], link['outwardIssue']['key']) )
-
-        # There is no sub-task equivalent in Gitlab
-        # Use a (sub-task, blocks, task) link instead
-        for subtask in issue['fields']['subtasks']:
-            import_status['links_todo'].add( (subtask['key'], "blocks", issue['key']) )
-
-        # Migrate attachments and get replacements for comments pointing at them
-        if MIGRATE_ATTACHMENTS and 'attachment' in issue['fields']:
-            replacements = move_attachments(issue['fields']['attachment'], gitlab_project_id)
-
-        # Create Gitlab issue
-        # Add a link to the Jira issue and mention all attachments in the description
-        gl_description = jira_text_2_gitlab_markdown(jira_project, issue['fields']['description'], replacements)
-        gl_description += "\n\n___\n\n"
-        gl_description += f"**Imported from Jira issue [{issue['key']}]({JIRA_URL}/browse/{issue['key']})**\n\n"
-
-        gl_reporter = resolve_login(reporter)['username']
-        if gl_reporter == GITLAB_ADMIN and reporter != 'jira':
-            gl_description += f"**Original creator of the issue: Jira user {reporter}**\n\n"
-
-        if MIGRATE_ATTACHMENTS:
-            for attachment in replacements.values():
-                if not attachment in gl_description:
-                    gl_description += f"Attachment imported from Jira issue [{issue['key']}]({JIRA_URL}/browse/{issue['key']}): {attachment}\n\n"
+        if (issue['key'] in import_status['issue_mapping'] and
+            import_status['issue_mapping'][issue['key']][1] == issue_hash):
+            print(f"[INFO] Issue {issue['key']} found in status with the same hash: previously imported and not changed.", flush=True)
+            continue
+        issues_todo.append((f"#{index}/{len(jira_issues)}", issue, issue_hash))
 
-        try:
-            gl_title = ""
-            if ADD_JIRA_KEY_TO_TITLE:
-                gl_title = f"[{issue['key']}] "
-            gl_title += f"{issue['fields']['summary']}"
-            original_title = ""
-
-            if len(gl_title) > 255:
-                # add full original title as a comment later on
-                original_title = f"Full original title:\n\n{gl_title}\n\n"
-                gl_title = gl_title[:252] + '...'
-
-            data = {
-                'created_at': issue['fields']['created'],
-                'assignee_ids': gl_assignee,
-                'title': gl_title,
-                'description': original_title + gl_description,
-                'milestone_id': gl_milestone_id,
-                'labels': ", ".join(gl_labels),
-            }
-            if weight is not None:
-                data['weight'] = weight
+    # Import issues into Gitlab
+    # Gitlab issues are created one at a time, in the original order,
+    # while the next ones are prepared concurrently.
+    # From now on, the first SIGINT lets the current issue finish (see sigint_handler)
+    global importing_issues
+    importing_issues = True
+    executor = ThreadPoolExecutor(max_workers=ISSUE_WORKERS)
+    try:
+        for (progress, issue, issue_hash), (epic_summary, replacements, uploads, markdown, commit_notes) in prepare_issues(executor, jira_project, issues_todo, gitlab_project_id):
+            # Stop between two issues, rather than leaving one half-imported
+            if interrupted.is_set():
+                raise SigIntException
+            migrate_issue(gitlab_project_id, gl_milestones, issue, issue_hash, epic_summary, replacements, uploads, markdown, commit_notes, progress)
+    finally:
+        # Don't prepare more issues if the import was interrupted
+        executor.shutdown(cancel_futures=True)
 
-            gl_issue = requests.post(
-                f"{GITLAB_API}/projects/{gitlab_project_id}/issues",
-                headers = {'PRIVATE-TOKEN': GITLAB_TOKEN,'Sudo': gl_reporter},
-                verify = VERIFY_SSL_CERTIFICATE,
-                json = data
-            )
-            gl_issue.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"data: {data} ... ")
-            raise Exception(f"Unable to create Gitlab issue for Jira issue {issue['key']}\n{e}")
-        gl_issue = gl_issue.json()
-        
-        # Collect Jira-Gitlab ID mapping and Jira issue hash
-        # to be used later for links and for incremental imports
-        import_status['issue_mapping'][issue['key']] = ({
-            'id': gl_issue['id'],
-            'project_id': gl_issue['project_id'],
-            'iid': gl_issue['iid'],
-            'full_ref': gl_issue['references']['full']
-        }, issue_hash)
-
-        # The Gitlab issue is created, now we add more information
-        # If anything after this point fails, we remove the issue to avoid half-imported issues
-        try:
-            # Add original comments
-            for comment in issue['fields']['comment']['comments']:
-                author = comment['author']['name']
-                gl_author = resolve_login(author)['username']
-                notice = ""
-                if gl_author == GITLAB_ADMIN and author != 'jira':
-                    notice = f"[ Original comment made by Jira user {author} ]\n\n"
 
-                note_add = requests.post(
-                    f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}/notes",
-                    headers = {'PRIVATE-TOKEN': GITLAB_TOKEN,'Sudo': gl_author},
-                    verify = VERIFY_SSL_CERTIFICATE,
-                    json = {
-                        'created_at': comment['created'],
-                        'body': notice + jira_text_2_gitlab_markdown(jira_project, comment['body'], replacements)
-                    }
-                )
-                note_add.raise_for_status()
+# Process the links collected during the import, LINK_WORKERS at a time
+# Processed links are removed from links_todo, the others are kept for the next run
+def process_links():
+    links_todo = list(import_status['links_todo'])
+    executor = ThreadPoolExecutor(max_workers=LINK_WORKERS)
+    try:
+        # The progress line is refreshed a few times per second, not for every link
+        last_progress = 0
+        for index, (link, processed) in enumerate(zip(links_todo, executor.map(process_link, links_todo)), start=1):
+            if time.monotonic() - last_progress > 0.2 or index == len(links_todo):
+                last_progress = time.monotonic()
+                (j_from, j_type, j_to) = link
+                print(f"\r[Info]: Processed link #{index}/{len(links_todo)} {j_from} {j_type} {j_to}        ", end='', flush=True)
+            if processed:
+                import_status['links_todo'].remove(link)
+    finally:
+        executor.shutdown(cancel_futures=True)
 
-            # migrate custom fields
-            custom_fields_comment = ''
-            for key, desc in JIRA_CUSTOM_FIELDS.items():
-                if key in issue['fields'] and issue['fields'][key]:
-                    field_value = str(issue['fields'][key]).replace('\n', "<br>")
-                    custom_fields_comment += f'| {desc} | {field_value} |\n'
-
-            if custom_fields_comment:
-                table_header = "| Additional metadata | Content |\n"
-                table_header += "| - | - |\n"
-                gl_author = GITLAB_ADMIN
-                note_add = requests.post(
-                    f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}/notes",
-                    headers = {'PRIVATE-TOKEN': GITLAB_TOKEN,'Sudo': gl_author},
-                    verify = VERIFY_SSL_CERTIFICATE,
-                    json = {
-                        'body': table_header + custom_fields_comment
-                    }
-                )
-                note_add.raise_for_status()
+    # Links skipped after an interruption are kept for the next run
+    if interrupted.is_set():
+        raise SigIntException
 
-            # Add worklogs
-            if MIGRATE_WORLOGS:
-                for worklog in issue['fields']['worklog']['worklogs']:
-                    # not all worklogs have a comment
-                    worklog_comment = ""
-                    if "comment" in worklog:
-                        worklog_comment = jira_text_2_gitlab_markdown(jira_project, worklog['comment'], replacements)
-                    author = worklog['author']['name']
-                    gl_author = resolve_login(author)['username']
-                    if gl_author == GITLAB_ADMIN and author != 'jira':
-                        body = f"[ Worklog {worklog['timeSpent']} (Original worklog by Jira user {author}) ]\n\n"
-                    else:
-                        body = f"[ Worklog {worklog['timeSpent']} ]\n\n"
-                    body += worklog_comment
-                    body += f"\n/spend {worklog['timeSpent']} {worklog['started'][:10]}"
-                    note_add = requests.post(
-                        f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}/notes",
-                        headers = {'PRIVATE-TOKEN': GITLAB_TOKEN,'Sudo': gl_author},
-                        verify = VERIFY_SSL_CERTIFICATE,
-                        json = {
-                            'created_at': worklog['started'],
-                            'body': body
-                        }
-                    )
-                    note_add.raise_for_status()
-
-            # Add comments to reference BitBucket commits
-            # Only the references to repos mapped in PROJECTS_BITBUCKET are added
-            # Note: this an internal call, it is not part of the public API. (https://jira.atlassian.com/browse/JSWCLOUD-16901)
-            if REFERECE_BITBUCKET_COMMITS:
-                devel_info = requests.get(
-                    f"{JIRA_URL}/rest/dev-status/latest/issue/detail?issueId={issue['id']}&applicationType=stash&dataType=repository",
-                    auth = HTTPBasicAuth(*JIRA_ACCOUNT),
-                    verify = VERIFY_SSL_CERTIFICATE,
-                    headers = {'Content-Type': 'application/json'},
-                    timeout = 60 # I've seen this call hang indefinitely. Use a timeout to prevent that.
-                )
-                devel_info.raise_for_status()
-                devel_info = devel_info.json()
-
-                for detail in devel_info['detail']:
-                    for repository in detail['repositories']:
-                        for commit in repository['commits']:
-                            match = re.match(BITBUCKET_COMMIT_PATTERN, commit['url'])
-                            if match is None:
-                                continue
-                            bitbucket_ref = f"{match.group(1)}/{match.group(2)}"
-                            if bitbucket_ref not in PROJECTS_BITBUCKET:
-                                continue
-                            commit_reference = f"[{commit['displayId']} in {bitbucket_ref}]({GITLAB_URL}/{PROJECTS_BITBUCKET[bitbucket_ref]}/-/commit/{commit['id']})"
-                            body = f"{commit['author']['name']} commited {commit_reference} : {commit['message']}"
-                            note_add = requests.post(
-                                f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}/notes",
-                                headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                                verify = VERIFY_SSL_CERTIFICATE,
-                                json = {
-                                    'created_at': commit['authorTimestamp'],
-                                    'body': body
-                                }
-                            )
-                            note_add.raise_for_status()
-
-
-            # Close "done" issues
-            # status-category can only be "new" (To Do) / "indeterminate" (In Progress) / "done" (Done) / "undefined" (Undefined)
-            if issue['fields']['status']['statusCategory']['key'] == "done" or issue['fields']['status']['name'] in ISSUE_STATUS_CLOSED:
-                data = { 'state_event': 'close' }
-                if issue['fields']['resolutiondate']:
-                    data['updated_at'] = issue['fields']['resolutiondate']
-                status = requests.put(
-                    f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}",
-                    headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                    verify = VERIFY_SSL_CERTIFICATE,
-                    json = data
-                )
-                status.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"{e}\n")
-            
-            requests.delete(
-                f"{GITLAB_API}/projects/{gitlab_project_id}/issues/{gl_issue['iid']}",
-                headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                verify = VERIFY_SSL_CERTIFICATE,
-            )
-            raise Exception(f"Unable to modify Gitlab issue {gl_issue['id']}. Removing issue and aborting.\n{e}")
+# Whether a failed request may succeed when tried again in a later run:
+# connection errors, retries exhausted by the session, 429 and 5xx responses.
+# Links that failed for another reason (e.g. 400, 403, 404) would fail again, they are not kept.
+def is_transient_error(e):
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.RetryError))
 
-        # Issue successfully imported.
-        # Write current status to file
-        store_import_status()
+# Create the Gitlab equivalent of a Jira link. Returns whether the link was processed.
+def process_link(link):
+    (j_from, j_type, j_to) = link
 
+    if interrupted.is_set():
+        return False
 
-def process_links():
-    for (j_from, j_type, j_to) in import_status['links_todo'].copy():
-        print(f"\r[Info]: Processing link {j_from} {j_type} {j_to}        ", end='', flush=True)
+    mapped_from = import_status['issue_mapping'].get(j_from)
+    mapped_to = import_status['issue_mapping'].get(j_to)
+    if mapped_from is None or mapped_to is None:
+        print(f"\n[WARN]: Skipping {j_from} {j_type} {j_to}, at least one of the Gitlab issues was not imported")
+        return False
 
-        if not (j_from in import_status['issue_mapping'] and j_to in import_status['issue_mapping']):
-            print(f"\n[WARN]: Skipping {j_from} {j_type} {j_to}, at least one of the Gitlab issues was not imported")
-            continue
+    gl_from = mapped_from[0]
+    gl_to = mapped_to[0]
 
-        gl_from = import_status['issue_mapping'][j_from][0]
-        gl_to = import_status['issue_mapping'][j_to][0]
+    # Only "outward" links were collected.
+    # I.e. we only need to process (a blocks b), as (b blocked by a) comes implicitly.
+    if j_type in ['relates to', 'blocks', 'causes']:
+        # Gitlab free only support "relates_to" links
+        gl_type = 'relates_to'
 
-        # Only "outward" links were collected.
-        # I.e. we only need to process (a blocks b), as (b blocked by a) comes implicitly.
-        if j_type in ['relates to', 'blocks', 'causes']:
-            # Gitlab free only support "relates_to" links
-            gl_type = 'relates_to'
+        if GITLAB_PREMIUM and j_type in ['relates to', 'blocks']:
+            gl_type = j_type.replace(' ', '_')
 
-            if GITLAB_PREMIUM and j_type in ['relates to', 'blocks']:
-                gl_type = j_type.replace(' ', '_')
+        try:
+            gl_link = gitlab_session.post(
+                f"{GITLAB_API}/projects/{gl_from['project_id']}/issues/{gl_from['iid']}/links",
+                json = {
+                    'target_project_id': gl_to['project_id'],
+                    'target_issue_iid': gl_to['iid'],
+                    'link_type': gl_type,
+                }
+            )
+            # The link may already exist, if it was created by an earlier run that did not record it
+            if gl_link.status_code != 409:
+                gl_link.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"\nUnable to create Gitlab issue link: {gl_from} {gl_type} {gl_to}\n{e}")
+            return not is_transient_error(e)
 
+        return True
+    else:
+        # these Jira links are treated differently in Gitlab
+        if j_type == 'duplicates':
             try:
-                gl_link = requests.post(
-                    f"{GITLAB_API}/projects/{gl_from['project_id']}/issues/{gl_from['iid']}/links",
-                    headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                    verify = VERIFY_SSL_CERTIFICATE,
+                note_add = gitlab_session.post(
+                    f"{GITLAB_API}/projects/{gl_from['project_id']}/issues/{gl_from['iid']}/notes",
                     json = {
-                        'target_project_id': gl_to['project_id'],
-                        'target_issue_iid': gl_to['iid'],
-                        'link_type': gl_type,
+                        'body': f"/duplicate {gl_to['full_ref']}"
                     }
                 )
-                gl_link.raise_for_status()
+                note_add.raise_for_status()
             except requests.exceptions.RequestException as e:
-                print(f"Unable to create Gitlab issue link: {gl_from} {gl_type} {gl_to}\n{e}")
-            
-            import_status['links_todo'].remove((j_from, j_type, j_to))
+                print(f"\n[WARN] Unable to create Gitlab issue link: {gl_from} {j_type} {gl_to}\n{e}")
+                return not is_transient_error(e)
+
+            return True
+        elif j_type == 'clones':
+            # No need to perform the cloning, as the cloned issue is already imported.
+            # Also, cloned issues become completely independent, so there is no real need to keep trace of this.
+            return False
         else:
-            # these Jira links are treated differently in Gitlab
-            if j_type == 'duplicates':
-                try:
-                    note_add = requests.post(
-                        f"{GITLAB_API}/projects/{gl_from['project_id']}/issues/{gl_from['iid']}/notes",
-                        headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-                        verify = VERIFY_SSL_CERTIFICATE,
-                        json = {
-                            'body': f"/duplicate {gl_to['full_ref']}"
-                        }
-                    )
-                    note_add.raise_for_status()
-                except requests.exceptions.RequestException as e:
-                    print(f"[WARN] Unable to create Gitlab issue link: {gl_from} {gl_type} {gl_to}\n{e}")
-
-                import_status['links_todo'].remove((j_from, j_type, j_to))
-            elif j_type == 'clones':
-                # No need to perform the cloning, as the cloned issue is already imported.
-                # Also, cloned issues become completely independent, so there is no real need to keep trace of this.
-                pass
-            else:
-                print(f"\n[WARN]: Don't know what to do with link type {j_type}!")
+            print(f"\n[WARN]: Don't know what to do with link type {j_type}!")
+            return False
 
 
+# Write the whole import status to file, as JSON
+# The file is replaced atomically, after which the journal is no longer needed
+# Issues are prepared in worker threads, which may make users admins meanwhile,
+# so the status is serialized under the users lock.
 def store_import_status():
-    with open('import_status.pickle', 'wb') as f:
-        pickle.dump(import_status, f, pickle.HIGHEST_PROTOCOL)
+    global issues_since_store
+    with gl_users_lock:
+        data = json.dumps(import_status, default=json_encoder)
+    with open(f'{IMPORT_STATUS_FILENAME}.tmp', 'w') as f:
+        f.write(data)
+        # Make sure the new status is on disk before it replaces the old one
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f'{IMPORT_STATUS_FILENAME}.tmp', IMPORT_STATUS_FILENAME)
+    Path(IMPORT_STATUS_JOURNAL).unlink(missing_ok=True)
+    issues_since_store = 0
+
+# Append a successfully imported issue to the journal, as one JSON line
+# The whole import status is only rewritten every IMPORT_STATUS_SAVE_EVERY issues
+def journal_import_status(issue_key, issue_links, uploads):
+    global issues_since_store
+    with gl_users_lock:
+        line = json.dumps([issue_key, import_status['issue_mapping'][issue_key], issue_links, import_status['gl_users_made_admin'], uploads], default=json_encoder)
+    with open(IMPORT_STATUS_JOURNAL, 'a') as f:
+        f.write(line + '\n')
+    issues_since_store += 1
+    if issues_since_store >= IMPORT_STATUS_SAVE_EVERY:
+        store_import_status()
 
 def load_import_status():
     try:
-        with open('import_status.pickle', 'rb') as f:
-            import_status = pickle.load(f)
-    except:
-        print("[INFO]: Creating new import_status file")
-        import_status = {
-            'issue_mapping': dict(),
-            'gl_users_made_admin' : set(),
-            'links_todo' : set()
-        }
+        with open(IMPORT_STATUS_FILENAME, 'rb') as f:
+            data = f.read()
+        if data.startswith(b'\x80'):
+            # A configuration written for earlier versions may still name their pickle file (import_status.pickle)
+            # It is loaded as such, and written back as JSON under the same name on the next save.
+            print(f"[INFO]: Loading pickled import_status from {IMPORT_STATUS_FILENAME}, it will be saved as JSON from now on")
+            import_status = pickle.loads(data)
+            import_status['attachment_uploads'] = dict()
+        else:
+            import_status = json.loads(data)
+            # JSON has no tuples and sets
+            import_status = {
+                'issue_mapping': {key: tuple(value) for key, value in import_status['issue_mapping'].items()},
+                'gl_users_made_admin' : set(import_status['gl_users_made_admin']),
+                'links_todo' : set(tuple(link) for link in import_status['links_todo']),
+                # Not written by earlier versions
+                'attachment_uploads': import_status.get('attachment_uploads', dict())
+            }
+        del data
+    except FileNotFoundError:
+        if Path(LEGACY_IMPORT_STATUS_FILENAME).exists():
+            # Status written by earlier versions, still loaded to continue their imports
+            print(f"[INFO]: Loading import_status from {LEGACY_IMPORT_STATUS_FILENAME}")
+            with open(LEGACY_IMPORT_STATUS_FILENAME, 'rb') as f:
+                import_status = pickle.load(f)
+            import_status['attachment_uploads'] = dict()
+        else:
+            print("[INFO]: Creating new import_status file")
+            import_status = {
+                'issue_mapping': dict(),
+                'gl_users_made_admin' : set(),
+                'links_todo' : set(),
+                'attachment_uploads': dict()
+            }
+
+    # Replay the issues imported after the last full write
+    # A truncated last line (crash while writing it) is ignored
+    try:
+        with open(IMPORT_STATUS_JOURNAL, 'r') as f:
+            print("[INFO]: Recovering import_status from journal")
+            for line in f:
+                (issue_key, gl_issue, issue_links, gl_users_made_admin, uploads) = json.loads(line)
+                import_status['issue_mapping'][issue_key] = tuple(gl_issue)
+                import_status['links_todo'] |= set(tuple(link) for link in issue_links)
+                import_status['gl_users_made_admin'] = set(gl_users_made_admin)
+                import_status['attachment_uploads'].update(uploads)
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        print("[WARN]: Ignoring truncated last entry of the import_status journal")
     return import_status
 
 
@@ -844,11 +1156,17 @@ def load_import_status():
 ################################################################
 
 # Users that were made admin during the import need to be changed back
+# They are changed back USER_WORKERS at a time. After a failure, the others are still changed back.
 def reset_user_privileges():
     print('\nResetting user privileges..\n')
-    for gl_username in import_status['gl_users_made_admin'].copy():
+    def reset_user_privilege(gl_username):
         print(f"- User {gl_users[gl_username]['username']} was made admin during the import to set the correct timestamps. Turning it back to non-admin.")
         gitlab_user_admin(gl_users[gl_username], False)
+
+    with ThreadPoolExecutor(max_workers=USER_WORKERS) as executor:
+        # Raises the first failure, once all users have been processed
+        for _ in executor.map(reset_user_privilege, list(import_status['gl_users_made_admin'])):
+            pass
     assert (not import_status['gl_users_made_admin'])
 
 def final_report():
@@ -890,63 +1208,57 @@ def wrapup():
     if not IMPORT_SUCCEEDED:
         exit(1)
 
+# The first SIGINT lets the current issue (or the links being created) finish, the import stops right after.
+# A second SIGINT interrupts it right away, as does a SIGINT before the first issue is imported.
 def sigint_handler(signum, frame):
-    print("\n\nMigration interrupted (SIGINT)\n")
-    raise SigIntException
+    if interrupted.is_set() or not importing_issues:
+        print("\n\nMigration interrupted (SIGINT)\n")
+        raise SigIntException
+    interrupted.set()
+    print("\n\nMigration interrupted (SIGINT), stopping after the current issue. Interrupt again to stop immediately.\n", flush=True)
 
 # register SIGINT handler, to catch interruptions and wrap up gracefully
+interrupted = threading.Event()
+importing_issues = False
 signal.signal(signal.SIGINT, sigint_handler)
 
 IMPORT_SUCCEEDED = False
 
+IMPORT_STATUS_JOURNAL = f'{IMPORT_STATUS_FILENAME}.journal'
+LEGACY_IMPORT_STATUS_FILENAME = 'import_status.pickle'
+
+# Number of issues imported since the import status was last fully written
+issues_since_store = 0
+
+# Protects gl_users and the user-related import status
+gl_users_lock = threading.Lock()
+
+# Gitlab users of the Jira users resolved so far (see resolve_login)
+resolved_logins = dict()
+
+# Summaries of Jira issues by ID, used as epic names (see get_epic_summary)
+epic_summaries = dict()
+
 BITBUCKET_COMMIT_PATTERN = ""
 if REFERECE_BITBUCKET_COMMITS and BITBUCKET_URL:
-    BITBUCKET_COMMIT_PATTERN = re.compile(fr"^{BITBUCKET_URL}/projects/([^/]+)/repos/([^/]+)/commits/\w+$")
+    BITBUCKET_COMMIT_PATTERN = re.compile(fr"^{re.escape(BITBUCKET_URL)}/projects/([^/]+)/repos/([^/]+)/commits/\w+$")
 
 if __name__ == "__main__":
-    if Path(IMPORT_STATUS_FILENAME).exists():
-        continue_pickle = input("Pickle file exists, continue? (y/n)\n")
-        if continue_pickle in "nN":
+    if Path(IMPORT_STATUS_FILENAME).exists() or Path(IMPORT_STATUS_JOURNAL).exists() or Path(LEGACY_IMPORT_STATUS_FILENAME).exists():
+        continue_import = input("Import status file exists, continue? (y/n)\n")
+        if continue_import in "nN":
             sys.exit(1)
 
     # Get available Gitlab namespaces
-    gl_namespaces = dict()
-    page = 1
-    while True:
-        rq = requests.get(
-            f'{GITLAB_API}/namespaces?page={str(page)}',
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
-        rq.raise_for_status()
-        for gl_namespace in rq.json():
-            gl_namespaces[gl_namespace['full_path']] = gl_namespace
-        if (rq.headers["x-page"] != rq.headers["x-total-pages"]):
-            page = rq.headers["x-next-page"] 
-        else:
-            break
+    gl_namespaces = {gl_namespace['full_path']: gl_namespace for gl_namespace in gitlab_get_all('/namespaces')}
 
     # Get available Gitlab users
-    gl_users = dict()
-    page = 1
-    while True:
-        rq = requests.get(
-            f'{GITLAB_API}/users?page={str(page)}', 
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE
-        )
-        rq.raise_for_status()
-        for gl_user in rq.json():
-            gl_users[gl_user['username']] = gl_user
-        if (rq.headers["x-page"] != rq.headers["x-total-pages"]):
-            page = rq.headers["x-next-page"] 
-        else:
-            break
+    gl_users = {gl_user['username']: gl_user for gl_user in gitlab_get_all('/users')}
 
     # Jira users that could not be mapped to Gitlab users
-    jira_users_not_mapped = dict()
+    jira_users_not_mapped = Counter()
     # Gitlab users that were mapped to, but could not be migrated
-    gl_users_not_migrated = dict()
+    gl_users_not_migrated = Counter()
 
     # Load previous import status
     import_status = load_import_status()
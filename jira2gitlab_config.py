@@ -10,7 +10,17 @@ JIRA_API = f'{JIRA_URL}/rest/api/2'
 BITBUCKET_URL = 'https://bitbucket.example.com'
 
 # How many items to request at a time from Jira (usually not more than 1000)
-JIRA_PAGINATION_SIZE = 100
+# Jira caps this to its own maximum, larger values just mean fewer round-trips
+JIRA_PAGINATION_SIZE = 1000
+
+# Number of pages of Jira issues that are loaded concurrently (per project, for jira-user-list.py)
+JIRA_SEARCH_WORKERS = 4
+
+# Number of Jira projects that jira-user-list.py looks at concurrently
+USER_LIST_PROJECT_WORKERS = 4
+
+# Number of pages of Gitlab lists (users, namespaces, milestones) that are loaded concurrently
+GITLAB_PAGE_WORKERS = 4
 
 # the Jira Epic custom field
 JIRA_EPIC_FIELD = 'customfield_10103'
@@ -42,7 +52,28 @@ GITLAB_PREMIUM = True
 ################################################################
 
 # Name of the file storing the status of imports
-IMPORT_STATUS_FILENAME = 'import_status.pickle'
+IMPORT_STATUS_FILENAME = 'import_status.json'
+
+# The import status is fully rewritten every IMPORT_STATUS_SAVE_EVERY imported issues.
+# In between, each imported issue is appended to a small journal file next to it,
+# which is replayed when the import is resumed after a crash.
+IMPORT_STATUS_SAVE_EVERY = 50
+
+# Number of issues whose epic name and attachments are fetched concurrently,
+# ahead of the issue being created in Gitlab (issues are still created one at a time, in order)
+ISSUE_WORKERS = 8
+
+# Number of attachments of an issue that are moved from Jira to Gitlab concurrently
+ATTACHMENT_WORKERS = 4
+
+# Number of comments and worklogs of an issue that are added to Gitlab concurrently
+NOTE_WORKERS = 4
+
+# Number of links between issues that are created concurrently, after all issues are imported
+LINK_WORKERS = 16
+
+# Number of Gitlab users whose admin status is changed back concurrently, at the end of the import
+USER_WORKERS = 8
 
 # Set this to false if JIRA / Gitlab is using self-signed certificate.
 VERIFY_SSL_CERTIFICATE = False
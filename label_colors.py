@@ -4,12 +4,14 @@ import urllib.parse
 from jira2gitlab_secrets import *
 from jira2gitlab_config import *
 
+# Connections to Gitlab are kept alive and reused across calls
+session = requests.Session()
+session.headers.update({'PRIVATE-TOKEN': GITLAB_TOKEN})
+session.verify = VERIFY_SSL_CERTIFICATE
 
 def get_project_id(project_path):
-    project = requests.get(
-        f"{GITLAB_API}/projects/{urllib.parse.quote(project_path, safe='')}",
-        headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-        verify = VERIFY_SSL_CERTIFICATE
+    project = session.get(
+        f"{GITLAB_API}/projects/{urllib.parse.quote(project_path, safe='')}"
     )
     return project.json()['id']
 
@@ -18,11 +20,9 @@ def get_labels(project_id):
     result = []
     page = 1
     while True:
-        next_labels = requests.get(
+        next_labels = session.get(
             f'{GITLAB_API}/projects/{project_id}/labels',
             params = {"per_page": 100, "page": page},
-            headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-            verify = VERIFY_SSL_CERTIFICATE,
         ).json()
         if not next_labels:
             return result
@@ -31,19 +31,15 @@ def get_labels(project_id):
 
 
 def update_label_color(project_id, label_id, label_color):
-    requests.put(
+    session.put(
         f'{GITLAB_API}/projects/{project_id}/labels/{label_id}',
-        headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-        verify = VERIFY_SSL_CERTIFICATE,
         json = {"color": label_color}
     )
 
 
 def create_label(project_id, label_name, label_color):
-    requests.post(
+    session.post(
         f'{GITLAB_API}/projects/{project_id}/labels',
-        headers = {'PRIVATE-TOKEN': GITLAB_TOKEN},
-        verify = VERIFY_SSL_CERTIFICATE,
         json = {"name": label_name, "color": label_color}
     )
 
@@ -51,9 +47,10 @@ def create_label(project_id, label_name, label_color):
 def create_or_update_label_colors(gitlab_project):
     print(f"\n\nUpdating label colors for {gitlab_project}")
     project_id = get_project_id(gitlab_project)
-    existing_labels = get_labels(project_id)
+    # Labels by name, the first one listed wins (as group labels are listed too)
+    existing_labels = {label["name"]: label for label in reversed(get_labels(project_id))}
     for label_name, label_color in LABEL_COLORS.items():
-        existing_label = next((x for x in existing_labels if x["name"] == label_name), None)
+        existing_label = existing_labels.get(label_name)
         if existing_label:
             if existing_label["color"] != label_color:
                 update_label_color(project_id, existing_label["id"], label_color)